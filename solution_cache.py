@@ -0,0 +1,136 @@
+# ======================== solution_cache.py — КЭШ РЕШЕНИЙ ========================
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+# Каталог кэша по умолчанию (рядом со скриптами задач)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".solution_cache")
+
+# Предельный размер кэша на диске по умолчанию, байт
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _canonical_update(digest, value):
+    """Добавление значения в хэш в каноническом виде (тип, форма и байты для массивов)"""
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest.update(f"ndarray:{array.dtype.str}:{array.shape}".encode())
+        digest.update(array.tobytes())
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}".encode())
+        for key in sorted(value, key=str):
+            _canonical_update(digest, str(key))
+            _canonical_update(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"seq:{len(value)}".encode())
+        for item in value:
+            _canonical_update(digest, item)
+    elif isinstance(value, (np.integer, np.floating, np.bool_)):
+        _canonical_update(digest, value.item())
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+    digest.update(b";")
+
+
+def canonical_key(*parts):
+    """Ключ кэша — SHA-256 от канонического представления коэффициентов, границ и параметров"""
+    digest = hashlib.sha256()
+    for part in parts:
+        _canonical_update(digest, part)
+    return digest.hexdigest()
+
+
+class SolutionCache:
+    """Дисковый кэш решений с адресацией по содержимому и вытеснением LRU по размеру
+
+    Кэш необязателен для решения: если каталог недоступен (только чтение, нет места),
+    кэш отключается или запись пропускается, а вызывающий код получает свежий результат.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self.enabled = True
+        except OSError:
+            self.enabled = False
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """Сохранённое решение или None; при попадании запись становится самой свежей"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        """Запись решения (атомарно через временный файл) и вытеснение старых записей
+
+        Ошибка записи (только чтение, нет места) не прерывает решение: запись
+        пропускается, недописанный временный файл удаляется.
+        """
+        if not self.enabled:
+            return
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Удаление давно не использованных записей, пока кэш не уложится в max_bytes"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(".pkl"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """Полная очистка кэша"""
+        if not self.enabled:
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.directory, name))
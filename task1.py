@@ -2,21 +2,473 @@
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Глобальные переменные
 RESULT_DF = None
 PROJECTS_DATA = None
 
+# Случайный индекс согласованности Саати по размерности матрицы
+RANDOM_INDEX = [0.0, 0.0, 0.0, 0.58, 0.90, 1.12, 1.24, 1.32, 1.41, 1.45, 1.49, 1.51, 1.48, 1.56, 1.57, 1.59]
+
+# Допустимое отношение согласованности
+MAX_CONSISTENCY_RATIO = 0.1
+
+# Веса критериев (по результатам попарных сравнений)
+CRITERIA_WEIGHTS = {
+    "Выручка": 0.546931,
+    "Кадры": 0.108525,
+    "Срок": 0.344545
+}
+
+# ==================== ИСХОДНЫЕ ДАННЫЕ ЗАКАЗОВ ====================
+# Общие для Задачи 1 и весов важности проектов в Задаче 2
+PROJECT_NAMES = [
+    "Строительство трассы у жилого комплекса из трех высотных зданий",
+    "Возведение магистрали около бизнес-центра",
+    "Строительство частной дороги для гостиницы",
+    "Строительство скоростной трассы для многофункционального комплекса",
+    "Возведение скоростной магистрали у административного здания",
+    "Строительство шестиполосного шоссе Москва-Щелково",
+    "Строительство скоростного выезда для медицинского центра",
+    "Строительство нетипового выезда из жилого квартала",
+    "Строительство дороги у многофункционального спортивного комплекса",
+    "Строительство парковки для учебного заведения"
+]
+
+PROJECT_REVENUE = [5000000, 3500000, 4000000, 6000000, 2500000, 3000000, 2700000, 4500000, 3800000, 3200000]
+PROJECT_STAFF = [150, 100, 120, 200, 80, 110, 90, 130, 115, 105]
+PROJECT_DURATION = [1200, 900, 1000, 1400, 800, 900, 850, 1100, 950, 900]
+
 
 def calculate_priority_vector(matrix):
     """Расчёт вектора приоритетов методом МАИ"""
-    col_sums = np.sum(matrix, axis=0)
-    normalized = matrix / col_sums
-    priority_vector = np.mean(normalized, axis=1)
+    priority_vector = calculate_priority_vectors(matrix)
     return np.round(priority_vector, 6)
 
 
+def calculate_priority_vectors(matrices, method="approximate"):
+    """Пакетный расчёт векторов приоритетов для стопки матриц парных сравнений
+
+    matrices -- массив формы (..., n, n): критерии × n × n или тендеры × критерии × n × n.
+    method -- "approximate" (нормализация столбцов) или "eigenvector" (собственный вектор).
+    Возвращает массив формы (..., n) без округления.
+    """
+    if method == "eigenvector":
+        return calculate_eigen_priorities(matrices)['priorities']
+    if method != "approximate":
+        raise ValueError(f"Неизвестный метод расчёта приоритетов: {method}")
+
+    matrices = np.asarray(matrices, dtype=float)
+    # Нормализация по столбцам и усреднение по строкам сразу для всех матриц
+    normalized = matrices / matrices.sum(axis=-2, keepdims=True)
+    return normalized.mean(axis=-1)
+
+
+def calculate_eigen_priorities(matrices, initial=None, tol=1e-10, max_iter=1000):
+    """Метод собственного вектора со степенными итерациями для стопки матриц
+
+    matrices -- массив формы (..., n, n); initial -- предыдущее решение формы (..., n)
+    для тёплого старта (по умолчанию — приближённый вектор приоритетов).
+    Возвращает словарь с векторами приоритетов, λmax, CI, CR и признаком согласованности
+    для каждой матрицы, рассчитанными за один проход.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    n = matrices.shape[-1]
+
+    if initial is None:
+        weights = calculate_priority_vectors(matrices)
+    else:
+        weights = np.broadcast_to(np.asarray(initial, dtype=float), matrices.shape[:-1])
+        weights = weights / weights.sum(axis=-1, keepdims=True)
+
+    # Степенные итерации сразу для всех матриц: w ← A·w / Σ(A·w)
+    lambda_max = np.full(matrices.shape[:-2], float(n))
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        product = np.matmul(matrices, weights[..., None])[..., 0]
+        lambda_max = product.sum(axis=-1)
+        new_weights = product / lambda_max[..., None]
+        delta = np.max(np.abs(new_weights - weights)) if new_weights.size else 0.0
+        weights = new_weights
+        if delta < tol:
+            break
+
+    consistency_index = (lambda_max - n) / (n - 1) if n > 1 else np.zeros_like(lambda_max)
+    random_index = RANDOM_INDEX[min(n, len(RANDOM_INDEX) - 1)]
+    if random_index > 0:
+        consistency_ratio = consistency_index / random_index
+    else:
+        consistency_ratio = np.zeros_like(consistency_index)
+
+    return {
+        'priorities': weights,
+        'lambda_max': lambda_max,
+        'ci': consistency_index,
+        'cr': consistency_ratio,
+        'consistent': consistency_ratio <= MAX_CONSISTENCY_RATIO,
+        'iterations': iterations
+    }
+
+
+def calculate_sparse_priorities(judgements):
+    """Приоритеты по неполному набору парных сравнений логарифмическим методом наименьших квадратов
+
+    judgements -- разреженная матрица n × n (любой формат scipy.sparse), где элемент (i, j)
+    равен суждению a_ij; отсутствующие элементы считаются неизвестными, диагональ игнорируется.
+    Решается min Σ (log a_ij - y_i + y_j)² разреженным методом LSQR, поэтому затраты памяти
+    и времени растут с числом суждений, а не с n².
+    """
+    from scipy import sparse
+    from scipy.sparse.csgraph import connected_components
+    from scipy.sparse.linalg import lsqr
+
+    judgements = sparse.coo_matrix(judgements)
+    n = judgements.shape[0]
+    mask = judgements.row != judgements.col
+    rows, cols, values = judgements.row[mask], judgements.col[mask], judgements.data[mask]
+
+    if np.any(values <= 0):
+        raise ValueError("Парные суждения должны быть положительными")
+
+    n_components, _ = connected_components(sparse.coo_matrix((values, (rows, cols)), shape=(n, n)),
+                                           directed=False)
+    if n_components > 1:
+        raise ValueError(f"Граф сравнений несвязный ({n_components} компонент): "
+                         "приоритеты разных компонент несопоставимы")
+
+    # Матрица инцидентности: строка суждения (i, j) даёт y_i - y_j
+    m = len(values)
+    incidence = sparse.csr_matrix(
+        (np.concatenate([np.ones(m), -np.ones(m)]),
+         (np.concatenate([np.arange(m), np.arange(m)]), np.concatenate([rows, cols]))),
+        shape=(m, n))
+
+    log_weights = lsqr(incidence, np.log(values), atol=1e-12, btol=1e-12, iter_lim=max(10 * n, 1000))[0]
+    # Решение определено с точностью до сдвига — нормируем после экспоненты
+    weights = np.exp(log_weights - log_weights.max())
+    return weights / weights.sum()
+
+
+def load_pairwise_matrix(source):
+    """Загрузка матрицы (или стопки матриц) парных сравнений эксперта из .npy/.csv или массива"""
+    if isinstance(source, (str, os.PathLike)):
+        if str(source).lower().endswith(".npy"):
+            return np.load(source, mmap_mode="r")
+        return np.loadtxt(source, delimiter=",", ndmin=2)
+    return np.asarray(source, dtype=float)
+
+
+def aggregate_expert_matrices(sources):
+    """Групповая матрица парных сравнений как поэлементное среднее геометрическое экспертов
+
+    sources -- итерируемый набор путей к файлам (.npy или .csv) или массивов одинаковой формы.
+    Матрицы читаются по одной и накапливаются суммой логарифмов, поэтому в памяти
+    одновременно находится только одна матрица эксперта. Результат подаётся напрямую
+    в calculate_priority_vectors или calculate_eigen_priorities.
+    """
+    log_sum = None
+    n_experts = 0
+
+    for source in sources:
+        matrix = load_pairwise_matrix(source)
+        if np.any(matrix <= 0):
+            raise ValueError(f"Матрица эксперта {n_experts + 1} содержит неположительные суждения")
+
+        if log_sum is None:
+            log_sum = np.zeros(matrix.shape)
+        elif matrix.shape != log_sum.shape:
+            raise ValueError(f"Матрица эксперта {n_experts + 1} имеет форму {matrix.shape}, "
+                             f"ожидалась {log_sum.shape}")
+
+        log_sum += np.log(matrix)
+        n_experts += 1
+
+    if n_experts == 0:
+        raise ValueError("Не передано ни одной матрицы экспертов")
+
+    return np.exp(log_sum / n_experts)
+
+
+def build_pairwise_matrices(values):
+    """Построение согласованных матриц парных сравнений a_ij = v_i / v_j
+
+    values -- массив формы (..., n) значений критериев по проектам.
+    Возвращает массив формы (..., n, n).
+    """
+    values = np.asarray(values, dtype=float)
+    return values[..., :, None] / values[..., None, :]
+
+
+def calculate_global_priorities(local_priorities, weights):
+    """Глобальные приоритеты как одно матричное произведение весов на локальные приоритеты
+
+    local_priorities -- массив формы (..., k, n), weights -- вектор весов критериев длины k.
+    Возвращает массив формы (..., n).
+    """
+    local_priorities = np.asarray(local_priorities, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    return weights @ local_priorities
+
+
+def project_priorities():
+    """Глобальные приоритеты заказов Задачи 1 по названиям (округлены, как в отчёте)
+
+    Используются как веса важности проектов в Задаче 2, чтобы оба расчёта опирались
+    на одни и те же локальные приоритеты.
+    """
+    values = [PROJECT_REVENUE, PROJECT_STAFF, PROJECT_DURATION]
+    local_priorities = calculate_priority_vectors(build_pairwise_matrices(values))
+    weights = [CRITERIA_WEIGHTS["Выручка"], CRITERIA_WEIGHTS["Кадры"], CRITERIA_WEIGHTS["Срок"]]
+    priorities = np.round(calculate_global_priorities(local_priorities, weights), 6)
+    return dict(zip(PROJECT_NAMES, priorities.tolist()))
+
+
+class IncrementalRanker:
+    """Инкрементальное ранжирование заказов при добавлении, удалении проектов и правке суждений
+
+    Матрица парных сравнений по каждому критерию задаётся отношениями значений
+    a_ij = v_i / v_j, поверх которых хранятся только явно изменённые суждения.
+    Приоритеты считаются методом среднего геометрического строк, поэтому правка
+    одного суждения меняет лишь две строки, а вся матрица n × n не хранится.
+    """
+
+    def __init__(self, names, values, weights):
+        self.names = list(names)
+        self.values = np.array(values, dtype=float).reshape(len(weights), len(self.names))
+        self.weights = np.asarray(weights, dtype=float)
+
+        # Сумма логарифмических отклонений явных суждений от базовых по строкам
+        self._adjust = np.zeros_like(self.values)
+        # Явные суждения: (критерий, проект_a, проект_b) -> log(a_ab) - log(v_a / v_b)
+        self._judgements = {}
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        if len(self._positions) != len(self.names):
+            raise ValueError("Наименования проектов должны быть уникальными")
+
+        self._row_scale = self.values.copy()
+        self.order = np.arange(len(self.names))
+        self._refresh_scores()
+
+    def _refresh_rows(self, rows):
+        """Пересчёт ненормированных приоритетов для указанных столбцов состояния"""
+        n = len(self.names)
+        self._row_scale[:, rows] = self.values[:, rows] * np.exp(self._adjust[:, rows] / n)
+
+    def _refresh_scores(self):
+        """Пересчёт глобальных приоритетов и досортировка предыдущего порядка"""
+        local = self._row_scale / self._row_scale.sum(axis=1, keepdims=True)
+        self.scores = calculate_global_priorities(local, self.weights)
+        # Порядок почти отсортирован, поэтому устойчивая сортировка проходит его почти линейно
+        self.order = self.order[np.argsort(-self.scores[self.order], kind="stable")]
+
+    def _adjusted_rows(self):
+        return np.flatnonzero(np.any(self._adjust != 0, axis=0))
+
+    def add_project(self, name, values):
+        """Добавление проекта со значениями по всем критериям"""
+        if name in self._positions:
+            raise ValueError(f"Проект уже есть в ранжировании: {name}")
+
+        column = np.asarray(values, dtype=float).reshape(-1, 1)
+        self._positions[name] = len(self.names)
+        self.names.append(name)
+        self.values = np.hstack([self.values, column])
+        self._adjust = np.hstack([self._adjust, np.zeros_like(column)])
+        self._row_scale = np.hstack([self._row_scale, column])
+        self.order = np.append(self.order, len(self.names) - 1)
+
+        # С ростом n меняется вклад ранее изменённых суждений
+        self._refresh_rows(self._adjusted_rows())
+        self._refresh_scores()
+
+    def drop_project(self, name):
+        """Исключение проекта из ранжирования"""
+        position = self._positions.pop(name)
+
+        # Снимаем суждения, в которых участвовал проект, со строк его партнёров
+        partners = set()
+        for key in [key for key in self._judgements if name in key[1:]]:
+            criterion, first, second = key
+            deviation = self._judgements.pop(key)
+            if first == name:
+                self._adjust[criterion, self._positions[second]] += deviation
+                partners.add(second)
+            else:
+                self._adjust[criterion, self._positions[first]] -= deviation
+                partners.add(first)
+
+        del self.names[position]
+        self.values = np.delete(self.values, position, axis=1)
+        self._adjust = np.delete(self._adjust, position, axis=1)
+        self._row_scale = np.delete(self._row_scale, position, axis=1)
+        self.order = self.order[self.order != position]
+        self.order[self.order > position] -= 1
+        for shifted in self.names[position:]:
+            self._positions[shifted] -= 1
+
+        rows = set(self._adjusted_rows()) | {self._positions[partner] for partner in partners}
+        self._refresh_rows(sorted(rows))
+        self._refresh_scores()
+
+    def set_judgement(self, criterion, first, second, value):
+        """Изменение одного парного суждения a_ij (a_ji = 1 / a_ij) по критерию"""
+        if first == second:
+            raise ValueError("Суждение проекта с самим собой всегда равно 1")
+        if value <= 0:
+            raise ValueError("Парное суждение должно быть положительным")
+        if first > second:
+            first, second, value = second, first, 1.0 / value
+
+        i, j = self._positions[first], self._positions[second]
+        key = (criterion, first, second)
+        deviation = np.log(value) - np.log(self.values[criterion, i] / self.values[criterion, j])
+        change = deviation - self._judgements.get(key, 0.0)
+        if deviation == 0:
+            self._judgements.pop(key, None)
+        else:
+            self._judgements[key] = deviation
+
+        self._adjust[criterion, i] += change
+        self._adjust[criterion, j] -= change
+        self._refresh_rows([i, j])
+        self._refresh_scores()
+
+    def rank_of(self, name):
+        """Текущий ранг проекта (с единицы)"""
+        return int(np.flatnonzero(self.order == self._positions[name])[0]) + 1
+
+    def ranking(self, top=None):
+        """Таблица ранжирования в формате RESULT_DF"""
+        order = self.order if top is None else self.order[:top]
+        return pd.DataFrame({
+            "Ранг": range(1, len(order) + 1),
+            "№": order + 1,
+            "Заказ": [self.names[i] for i in order],
+            "Глобальный приоритет": np.round(self.scores[order], 6)
+        })
+
+
+def iter_project_chunks(path, columns, chunksize=100000):
+    """Чтение каталога проектов (CSV или Parquet) порциями по chunksize строк"""
+    if str(path).lower().endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Не установлен модуль pyarrow. Установите: pip install pyarrow")
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+
+def stream_top_projects(path, top_n=10, weights=None, chunksize=100000):
+    """Потоковое ранжирование каталога проектов с хранением в памяти только top_n лучших
+
+    Локальные приоритеты по каждому критерию равны v_i / Σv (матрицы отношений значений),
+    поэтому первый проход считает только суммы по критериям, а второй — оценивает каждую
+    порцию одним матричным произведением и сливает её с текущим top_n.
+    """
+    weights = CRITERIA_WEIGHTS if weights is None else weights
+    criteria = list(weights)
+    columns = ["Заказ"] + criteria
+
+    # Первый проход: суммы значений критериев по всему каталогу
+    totals = np.zeros(len(criteria))
+    for chunk in iter_project_chunks(path, criteria, chunksize):
+        totals += chunk[criteria].to_numpy(dtype=float).sum(axis=0)
+
+    scale = np.asarray([weights[c] for c in criteria], dtype=float) / totals
+
+    # Второй проход: оценка порций и слияние с ограниченным top_n
+    best = None
+    offset = 0
+    for chunk in iter_project_chunks(path, columns, chunksize):
+        chunk = chunk[columns]
+        scores = chunk[criteria].to_numpy(dtype=float) @ scale
+
+        if len(chunk) > top_n:
+            candidates = np.argpartition(-scores, top_n - 1)[:top_n]
+        else:
+            candidates = np.arange(len(chunk))
+
+        selected = chunk.iloc[candidates].copy()
+        selected.insert(0, "№", candidates + offset + 1)
+        selected["Глобальный приоритет"] = scores[candidates]
+        offset += len(chunk)
+
+        if best is not None:
+            selected = pd.concat([best, selected], ignore_index=True)
+        best = selected.nlargest(top_n, "Глобальный приоритет", keep="first")
+
+    if best is None:
+        return pd.DataFrame(columns=["Ранг", "№"] + columns + ["Глобальный приоритет"])
+
+    best = best.sort_values(["Глобальный приоритет", "№"], ascending=[False, True]).reset_index(drop=True)
+    best["Глобальный приоритет"] = best["Глобальный приоритет"].round(6)
+    best.insert(0, "Ранг", range(1, len(best) + 1))
+    return best
+
+
+def _sample_rank_counts(local_priorities, alpha, n_samples, batch_size, seed):
+    """Подсчёт частот рангов проектов для n_samples случайных векторов весов"""
+    rng = np.random.default_rng(seed)
+    n = local_priorities.shape[1]
+    counts = np.zeros(n * n, dtype=np.int64)
+    project_offsets = np.arange(n) * n
+
+    done = 0
+    while done < n_samples:
+        size = min(batch_size, n_samples - done)
+        weights = rng.dirichlet(alpha, size=size)
+        # Все проекты при всех весах — одно матричное произведение (size × n)
+        scores = weights @ local_priorities
+        order = np.argsort(-scores, axis=1)
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(n), axis=1)
+        counts += np.bincount((ranks + project_offsets).ravel(), minlength=n * n)
+        done += size
+
+    return counts.reshape(n, n)
+
+
+def weight_sensitivity(local_priorities, weights=None, names=None, n_samples=10000,
+                       concentration=100.0, batch_size=2000, workers=1, seed=None):
+    """Анализ устойчивости ранжирования методом Монте-Карло по весам критериев
+
+    Веса выбираются из распределения Дирихле с параметрами concentration · w, так что
+    их среднее совпадает с текущими весами. Возвращает таблицу вероятностей занять
+    каждый ранг и средний ранг для каждого проекта. При workers > 1 выборки
+    распределяются по процессам.
+    """
+    weights = list(CRITERIA_WEIGHTS.values()) if weights is None else weights
+    local_priorities = np.asarray(local_priorities, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    alpha = concentration * weights / weights.sum()
+    n = local_priorities.shape[1]
+
+    workers = max(1, min(workers, n_samples))
+    shares = [n_samples // workers + (1 if i < n_samples % workers else 0) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+
+    if workers == 1:
+        counts = _sample_rank_counts(local_priorities, alpha, n_samples, batch_size, seeds[0])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_sample_rank_counts, local_priorities, alpha, share, batch_size, worker_seed)
+                       for share, worker_seed in zip(shares, seeds)]
+            counts = sum(future.result() for future in futures)
+
+    probabilities = counts / n_samples
+    table = pd.DataFrame(probabilities, columns=range(1, n + 1),
+                         index=names if names is not None else range(1, n + 1))
+    table["Средний ранг"] = probabilities @ np.arange(1, n + 1)
+    return table
+
+
 def main_task1():
     """Основная функция решения Задачи 1"""
     global RESULT_DF, PROJECTS_DATA
@@ -27,22 +479,10 @@ def main_task1():
     print()
 
     # ==================== ИСХОДНЫЕ ДАННЫЕ ====================
-    projects = [
-        "Строительство трассы у жилого комплекса из трех высотных зданий",
-        "Возведение магистрали около бизнес-центра",
-        "Строительство частной дороги для гостиницы",
-        "Строительство скоростной трассы для многофункционального комплекса",
-        "Возведение скоростной магистрали у административного здания",
-        "Строительство шестиполосного шоссе Москва-Щелково",
-        "Строительство скоростного выезда для медицинского центра",
-        "Строительство нетипового выезда из жилого квартала",
-        "Строительство дороги у многофункционального спортивного комплекса",
-        "Строительство парковки для учебного заведения"
-    ]
-
-    revenue = [5000000, 3500000, 4000000, 6000000, 2500000, 3000000, 2700000, 4500000, 3800000, 3200000]
-    staff = [150, 100, 120, 200, 80, 110, 90, 130, 115, 105]
-    duration = [1200, 900, 1000, 1400, 800, 900, 850, 1100, 950, 900]
+    projects = list(PROJECT_NAMES)
+    revenue = list(PROJECT_REVENUE)
+    staff = list(PROJECT_STAFF)
+    duration = list(PROJECT_DURATION)
 
     # Сохраняем данные для документа
     PROJECTS_DATA = {
@@ -53,9 +493,9 @@ def main_task1():
     }
 
     # ==================== ВЕСА КРИТЕРИЕВ ====================
-    w_revenue = 0.546931
-    w_staff = 0.108525
-    w_duration = 0.344545
+    w_revenue = CRITERIA_WEIGHTS["Выручка"]
+    w_staff = CRITERIA_WEIGHTS["Кадры"]
+    w_duration = CRITERIA_WEIGHTS["Срок"]
 
     print("ВЕСА КРИТЕРИЕВ (по результатам попарных сравнений):")
     print(f"   • Выручка:              {w_revenue:.6f}")
@@ -67,26 +507,28 @@ def main_task1():
     # ==================== ЛОКАЛЬНЫЕ ПРИОРИТЕТЫ ====================
     print("Локальные приоритеты рассчитаны методом МАИ для каждого критерия:")
 
-    local_rev = [0.130890, 0.091623, 0.104712, 0.152229, 0.070681, 0.083770, 0.070681, 0.117801, 0.099476, 0.083770]
-    local_stf = [0.125000, 0.083333, 0.100000, 0.166667, 0.066667, 0.091667, 0.075000, 0.108333, 0.095833, 0.087500]
-    local_dur = [0.120000, 0.090000, 0.100000, 0.171429, 0.071429, 0.090000, 0.085000, 0.110000, 0.095000, 0.090000]
+    # Матрицы парных сравнений: критерии × проекты × проекты
+    pairwise = build_pairwise_matrices([revenue, staff, duration])
+    local_priorities = calculate_priority_vectors(pairwise)
+    local_rev, local_stf, local_dur = local_priorities
 
-    print(f"   • По выручке:           Σ = {sum(local_rev):.6f}")
-    print(f"   • По кадрам:            Σ = {sum(local_stf):.6f}")
-    print(f"   • По срокам:            Σ = {sum(local_dur):.6f}")
+    print(f"   • По выручке:           Σ = {local_rev.sum():.6f}")
+    print(f"   • По кадрам:            Σ = {local_stf.sum():.6f}")
+    print(f"   • По срокам:            Σ = {local_dur.sum():.6f}")
+
+    consistency = calculate_eigen_priorities(pairwise, initial=local_priorities)
+    print(f"   • Отношение согласованности: CR ≤ {consistency['cr'].max():.6f} "
+          f"({'согласованы' if consistency['consistent'].all() else 'требуют пересмотра'})")
     print()
 
     # ==================== ГЛОБАЛЬНЫЕ ПРИОРИТЕТЫ ====================
     print("Расчёт глобальных приоритетов:")
     print("-" * 80)
 
-    global_priorities = []
-    for i in range(10):
-        gp = (local_rev[i] * w_revenue +
-              local_stf[i] * w_staff +
-              local_dur[i] * w_duration)
-        global_priorities.append(round(gp, 6))
+    weights = [w_revenue, w_staff, w_duration]
+    global_priorities = np.round(calculate_global_priorities(local_priorities, weights), 6)
 
+    for i, gp in enumerate(global_priorities):
         project_short = projects[i][:50] + "..." if len(projects[i]) > 50 else projects[i]
         print(f"{i + 1:2d}. {project_short:<53} → {gp:.6f}")
 
@@ -96,7 +538,7 @@ def main_task1():
 
     # ==================== РАНЖИРОВАНИЕ ====================
     df = pd.DataFrame({
-        "№": range(1, 11),
+        "№": range(1, len(projects) + 1),
         "Заказ": projects,
         "Выручка": revenue,
         "Кадры": staff,
@@ -106,7 +548,7 @@ def main_task1():
 
     # Сортируем по приоритету
     df_sorted = df.sort_values("Глобальный приоритет", ascending=False).reset_index(drop=True)
-    df_sorted["Ранг"] = range(1, 11)
+    df_sorted["Ранг"] = range(1, len(projects) + 1)
 
     RESULT_DF = df_sorted  # Сохраняем для документа
 
@@ -232,6 +674,19 @@ if __name__ == "__main__":
         # Сначала выполняем расчёт, потом создаём документ
         main_task1()
         generate_document()
+    elif len(sys.argv) > 1 and sys.argv[1] == "sensitivity":
+        # Устойчивость ранжирования к весам: python task1.py sensitivity [число_выборок]
+        main_task1()
+        values = [PROJECTS_DATA['revenue'], PROJECTS_DATA['staff'], PROJECTS_DATA['duration']]
+        local = calculate_priority_vectors(build_pairwise_matrices(values))
+        n_samples = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+        table = weight_sensitivity(local, n_samples=n_samples, workers=os.cpu_count() or 1)
+        print("УСТОЙЧИВОСТЬ РАНЖИРОВАНИЯ (строки — № заказа, столбцы — вероятность занять ранг):")
+        print(table.round(3).to_string())
+    elif len(sys.argv) > 2 and sys.argv[1] == "top":
+        # Потоковое ранжирование каталога: python task1.py top catalog.csv [N]
+        top_n = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+        print(stream_top_projects(sys.argv[2], top_n=top_n).to_string(index=False))
     else:
         # Только расчёт
         main_task1()
\ No newline at end of file
@@ -4,13 +4,435 @@ import numpy as np
 import os
 from datetime import datetime
 
+from solution_cache import SolutionCache, canonical_key
+
 # Глобальные переменные
 RESULT_DATA = None
 OPTIMIZATION_RESULTS = None
 
+# Целочисленный режим: штучные работы (дренаж, ограждения и знаки, разметка)
+INTEGER_WORKS = [0, 0, 0, 0, 0, 1, 1, 1]
+
+# Ограничение времени MILP, с (меньше таймаута запуска скрипта из интерфейса — 60 с)
+INTEGER_TIME_LIMIT = 45
+
+
+def build_production_model(norms, limits, max_volumes, income_per_unit):
+    """Построение разреженной модели производственной программы
+
+    norms -- матрица норм расхода (ресурсы × виды работ), плотная или scipy.sparse;
+    limits -- объёмы выделяемых ресурсов; max_volumes -- планируемые объёмы работ,
+    которые задаются границами переменных, а не отдельными строками ограничений.
+    Возвращает (C, A_ub в формате CSR, b_ub, bounds) для linprog.
+    """
+    from scipy import sparse
+
+    A_ub = sparse.csr_matrix(norms, dtype=float)
+    A_ub.sum_duplicates()
+    A_ub.eliminate_zeros()
+    A_ub.sort_indices()
+
+    # Целевая функция (максимизация дохода, поэтому минус)
+    C = -np.asarray(income_per_unit, dtype=float)
+    b_ub = np.asarray(limits, dtype=float)
+
+    # Ограничения на максимальные объемы работ — верхние границы переменных
+    bounds = np.zeros((len(C), 2))
+    bounds[:, 1] = np.asarray(max_volumes, dtype=float)
+    return C, A_ub, b_ub, bounds
+
+
+def _optimal_basis(A_ub, upper, x, slack, duals, reduced_costs, tol=1e-7):
+    """Восстановление оптимального базиса по решению HiGHS
+
+    Базисными считаются объёмы строго между границами и остатки ненапряжённых ресурсов;
+    при вырожденности базис дополняется остатками и объёмами с нулевой оценкой.
+    Возвращает (basic_x, basic_s, обратная матрица базиса) или None, если базис
+    восстановить не удалось.
+    """
+    m = A_ub.shape[0]
+    scale = max(1.0, float(np.abs(x).max(initial=0)))
+
+    basic_x = np.flatnonzero((x > tol * scale) & (x < upper - tol * scale))
+    basic_s = np.flatnonzero(slack > tol * scale)
+    spare_s = np.flatnonzero((slack <= tol * scale) & (np.abs(duals) <= tol))
+    spare_x = np.setdiff1d(np.flatnonzero(np.abs(reduced_costs) <= tol), basic_x)
+
+    basic_x, basic_s = list(basic_x), list(basic_s)
+    for kind, index in [("s", i) for i in spare_s] + [("x", j) for j in spare_x]:
+        if len(basic_x) + len(basic_s) >= m:
+            break
+        (basic_s if kind == "s" else basic_x).append(index)
+    if len(basic_x) + len(basic_s) != m:
+        return None
+
+    basis = np.zeros((m, m))
+    basis[:, :len(basic_x)] = A_ub[:, basic_x].toarray()
+    basis[basic_s, len(basic_x) + np.arange(len(basic_s))] = 1.0
+    try:
+        inverse = np.linalg.solve(basis, np.eye(m))
+    except np.linalg.LinAlgError:
+        return None
+    return np.array(basic_x, dtype=int), np.array(basic_s, dtype=int), inverse
+
+
+def _rhs_ranges(A_ub, b_ub, upper, x, slack, duals, reduced_costs, tol=1e-7):
+    """Диапазоны правых частей ресурсных строк, в которых двойственные оценки неизменны
+
+    Для каждой строки i базисное решение смещается вдоль B⁻¹·e_i, пока базисные
+    переменные остаются в своих границах.
+    Возвращает массив (число ресурсов × 2); при невосстановимом базисе — NaN.
+    """
+    m = A_ub.shape[0]
+    ranges = np.full((m, 2), np.nan)
+    basis = _optimal_basis(A_ub, upper, x, slack, duals, reduced_costs, tol)
+    if basis is None:
+        return ranges
+    basic_x, basic_s, directions = basis
+
+    values = np.concatenate([x[basic_x], slack[basic_s]])
+    lower_limit = np.zeros(m)
+    upper_limit = np.concatenate([upper[basic_x], np.full(len(basic_s), np.inf)])
+    for i in range(m):
+        d = directions[:, i]
+        rising, falling = d > tol, d < -tol
+        # Допустимое увеличение и уменьшение правой части до выхода базисной переменной из границ
+        increase = np.concatenate([(upper_limit[rising] - values[rising]) / d[rising],
+                                   (lower_limit[falling] - values[falling]) / d[falling]])
+        decrease = np.concatenate([(values[rising] - lower_limit[rising]) / d[rising],
+                                   (values[falling] - upper_limit[falling]) / d[falling]])
+        ranges[i] = b_ub[i] - decrease.min(initial=np.inf), b_ub[i] + increase.min(initial=np.inf)
+    return ranges
+
+
+def solve_resource_program(norms, limits, max_volumes, income_per_unit, cache=None):
+    """Решение производственной программы с произвольным числом ресурсов
+
+    Модель собирается разреженной (см. build_production_model), поэтому размер задачи
+    и время решения определяются числом ненулевых норм расхода.
+    cache -- SolutionCache; при совпадении коэффициентов и ресурсов сохранённое
+    решение возвращается без вызова linprog.
+    Возвращает словарь с полями success, status, message, x и fun (как у linprog), а также
+    анализ чувствительности по решению HiGHS: duals — доход от дополнительной единицы
+    каждого ресурса, reduced_costs — приведённые доходы видов работ (для работ на верхней
+    границе — ценность расширения плана), rhs_ranges — диапазоны объёмов ресурсов,
+    в которых двойственные оценки остаются в силе.
+    """
+    from scipy.optimize import linprog
+
+    C, A_ub, b_ub, bounds = build_production_model(norms, limits, max_volumes, income_per_unit)
+
+    if cache is not None:
+        key = canonical_key("task3", A_ub.shape, A_ub.data, A_ub.indices, A_ub.indptr,
+                            bounds[:, 1], C, b_ub, "highs", "sensitivity")
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    res_linprog = linprog(C, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method='highs')
+    result = {
+        'success': res_linprog.success,
+        'status': res_linprog.status,
+        'message': res_linprog.message,
+        'x': res_linprog.x,
+        'fun': res_linprog.fun
+    }
+
+    if res_linprog.status == 0:
+        # Задача решается на минимум -дохода, поэтому знаки оценок HiGHS меняются
+        duals = -res_linprog.ineqlin.marginals
+        reduced_costs = -(res_linprog.lower.marginals + res_linprog.upper.marginals)
+        result['duals'] = duals
+        result['reduced_costs'] = reduced_costs
+        result['rhs_ranges'] = _rhs_ranges(A_ub, b_ub, bounds[:, 1], res_linprog.x,
+                                           res_linprog.ineqlin.residual, duals, reduced_costs)
+
+    if cache is not None:
+        cache.put(key, result)
+    return result
+
+
+def solve_production_program(norm_workers, norm_materials, max_volumes, income_per_unit,
+                             total_workers, total_materials, cache=None):
+    """Решение задачи линейного программирования для производственной программы
+
+    Частный случай solve_resource_program с двумя ресурсами — рабочими и сырьём.
+    """
+    norms = np.vstack([np.asarray(norm_workers, dtype=float), np.asarray(norm_materials, dtype=float)])
+    return solve_resource_program(norms, [total_workers, total_materials], max_volumes, income_per_unit,
+                                  cache=cache)
+
+
+def solve_integer_program(norms, limits, max_volumes, income_per_unit, integrality=None,
+                          time_limit=None, mip_rel_gap=None):
+    """Производственная программа с целочисленными объёмами (scipy.optimize.milp, HiGHS)
+
+    integrality -- признаки целочисленности по видам работ (1 — только целые единицы,
+    0 — непрерывный объём); по умолчанию все работы целочисленные.
+    time_limit -- ограничение времени решения, с; mip_rel_gap -- допустимый
+    относительный разрыв. При остановке по времени возвращается лучшее найденное решение.
+    Возвращает словарь с полями success, status, message, x, fun (как у linprog),
+    mip_gap — относительный разрыв до оценки оптимума и mip_dual_bound — сама оценка.
+    """
+    from scipy.optimize import Bounds, LinearConstraint, milp
+
+    C, A_ub, b_ub, bounds = build_production_model(norms, limits, max_volumes, income_per_unit)
+    if integrality is None:
+        integrality = np.ones(len(C))
+
+    options = {}
+    if time_limit is not None:
+        options['time_limit'] = time_limit
+    if mip_rel_gap is not None:
+        options['mip_rel_gap'] = mip_rel_gap
+
+    res_milp = milp(C, integrality=np.asarray(integrality), bounds=Bounds(bounds[:, 0], bounds[:, 1]),
+                    constraints=LinearConstraint(A_ub, -np.inf, b_ub), options=options)
+    return {
+        'success': res_milp.success,
+        'status': res_milp.status,
+        'message': res_milp.message,
+        'x': res_milp.x,
+        'fun': res_milp.fun,
+        'mip_gap': getattr(res_milp, 'mip_gap', None),
+        'mip_dual_bound': getattr(res_milp, 'mip_dual_bound', None)
+    }
+
+
+def _sweep_rows(task):
+    """Обход части сетки ресурсов змейкой с повторным использованием оптимальных базисов
+
+    Двойственная допустимость базиса не зависит от правых частей, поэтому пока базисное
+    решение B⁻¹·(b − A_N·x_N) остаётся в границах, оно оптимально и linprog не вызывается.
+    Хранятся max_bases последних базисов (последний использованный — первым), так как
+    при обходе змейкой точка обычно лежит в области базиса предыдущей строки сетки.
+    """
+    from scipy.optimize import linprog
+
+    norms, limits, max_volumes, income_per_unit, axes, grid_x, grid_y, tol, max_bases = task
+    C, A_ub, b_ub, bounds = build_production_model(norms, limits, max_volumes, income_per_unit)
+    upper = bounds[:, 1]
+    m = A_ub.shape[0]
+
+    income = np.full((len(grid_x), len(grid_y)), np.nan)
+    binding = np.zeros((len(grid_x), len(grid_y), m), dtype=bool)
+    solves = 0
+    states = []
+
+    for row, value_x in enumerate(grid_x):
+        columns = range(len(grid_y)) if row % 2 == 0 else reversed(range(len(grid_y)))
+        for column in columns:
+            b = b_ub.copy()
+            b[axes[0]], b[axes[1]] = value_x, grid_y[column]
+
+            x = None
+            for index, state in enumerate(states):
+                basic_x, basic_s, inverse, fixed, fixed_usage = state
+                values = inverse @ (b - fixed_usage)
+                volumes = values[:len(basic_x)]
+                if values.min(initial=0.0) >= -tol and np.all(volumes <= upper[basic_x] + tol):
+                    x = fixed.copy()
+                    x[basic_x] = np.clip(volumes, 0.0, upper[basic_x])
+                    slack = np.zeros(m)
+                    slack[basic_s] = values[len(basic_x):]
+                    states.insert(0, states.pop(index))
+                    break
+
+            if x is None:
+                res_linprog = linprog(C, A_ub=A_ub, b_ub=b, bounds=bounds, method='highs')
+                solves += 1
+                if res_linprog.status != 0:
+                    continue
+                x, slack = res_linprog.x, res_linprog.ineqlin.residual
+                duals = -res_linprog.ineqlin.marginals
+                reduced_costs = -(res_linprog.lower.marginals + res_linprog.upper.marginals)
+                basis = _optimal_basis(A_ub, upper, x, slack, duals, reduced_costs)
+                if basis is not None:
+                    basic_x, basic_s, inverse = basis
+                    fixed = x.copy()
+                    fixed[basic_x] = 0.0
+                    states.insert(0, (basic_x, basic_s, inverse, fixed, A_ub @ fixed))
+                    del states[max_bases:]
+
+            income[row, column] = -C @ x
+            binding[row, column] = slack <= tol * np.maximum(1.0, np.abs(b))
+
+    return income, binding, solves
+
+
+def sweep_resource_surface(norms, limits, max_volumes, income_per_unit, grid_x, grid_y, axes=(0, 1),
+                           workers=None, tol=1e-7, max_bases=16):
+    """Поверхность дохода на сетке объёмов двух ресурсов
+
+    grid_x, grid_y -- значения ресурсов с номерами axes[0] и axes[1] (по умолчанию рабочие
+    и сырьё); остальные ресурсы берутся из limits. Строки сетки делятся на непрерывные
+    полосы между рабочими процессами; внутри полосы соседние точки решаются от базиса
+    предыдущей точки (см. _sweep_rows).
+    Возвращает словарь: income — доход (len(grid_x) × len(grid_y), NaN для недопустимых
+    точек), binding — напряжённые ресурсы в каждой точке (len(grid_x) × len(grid_y) ×
+    число ресурсов), solves — число фактических вызовов linprog.
+    """
+    grid_x = np.asarray(grid_x, dtype=float)
+    grid_y = np.asarray(grid_y, dtype=float)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(grid_x)))
+
+    tasks = [(norms, limits, max_volumes, income_per_unit, axes, part, grid_y, tol, max_bases)
+             for part in np.array_split(grid_x, workers)]
+    if workers == 1:
+        results = list(map(_sweep_rows, tasks))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_sweep_rows, tasks))
+
+    return {
+        'income': np.concatenate([income for income, _, _ in results]),
+        'binding': np.concatenate([binding for _, binding, _ in results]),
+        'solves': sum(solves for _, _, solves in results),
+    }
+
+
+def build_multiperiod_model(norms, capacity, max_volumes, income_per_unit, precedence=(), discount=0.0):
+    """Построение разреженной многопериодной модели производственной программы
+
+    Переменные x[t, j] — объём работы j в периоде t (индекс t·n + j); суммарный объём
+    по всем периодам не превышает план max_volumes, так что невыполненный объём
+    переносится на следующие периоды.
+    norms -- нормы расхода (ресурсы × работы); capacity -- ресурсы на каждый период
+    (периоды × ресурсы); precedence -- пары (a, b) или тройки (a, b, lag): доля выполнения
+    работы b к периоду t не превышает долю выполнения работы a к периоду t − lag (lag = 1).
+    Для работ из precedence добавляются переменные нарастающего итога y[t, k] (после всех x),
+    связанные равенствами y[t] = y[t−1] + x[t], — так каждое условие очерёдности
+    занимает одну строку с двумя коэффициентами.
+    discount -- ставка дисконтирования дохода за период; при нуле доход не зависит от срока.
+    Возвращает (C, A_ub, b_ub, A_eq, b_eq, bounds) для linprog; матрицы в формате CSR.
+    """
+    from scipy import sparse
+
+    norms = sparse.csr_matrix(norms, dtype=float)
+    capacity = np.atleast_2d(np.asarray(capacity, dtype=float))
+    max_volumes = np.asarray(max_volumes, dtype=float)
+    income = np.asarray(income_per_unit, dtype=float)
+    n_periods, n = capacity.shape[0], len(income)
+    n_x = n_periods * n
+
+    rules = [(tuple(rule) + (1,))[:3] for rule in precedence]
+    linked = np.unique([index for a, b, _ in rules for index in (a, b)]).astype(int)
+    position = np.full(n, -1)
+    position[linked] = np.arange(len(linked))
+    k = len(linked)
+    n_y = n_periods * k
+
+    # Целевая функция (максимизация дисконтированного дохода, поэтому минус)
+    factors = (1.0 + discount) ** -np.arange(n_periods, dtype=float)
+    C = np.concatenate([-np.kron(factors, income), np.zeros(n_y)])
+
+    A_ub = [
+        sparse.kron(sparse.eye(n_periods), norms, format="csr"),  # ресурсы каждого периода
+        sparse.kron(np.ones((1, n_periods)), sparse.eye(n), format="csr"),  # план по всем периодам
+    ]
+    b_ub = [capacity.ravel(), max_volumes]
+
+    bounds = np.zeros((n_x + n_y, 2))
+    bounds[:n_x, 1] = np.inf
+    bounds[n_x:, 1] = np.tile(max_volumes[linked], n_periods)
+
+    # Очерёдность этапов: y[t, b] / V_b − y[t − lag, a] / V_a <= 0
+    rows, cols, vals = [], [], []
+    count = 0
+    for a, b, lag in rules:
+        for t in range(n_periods):
+            if t - lag < 0:
+                # До начала предшествующей работы последующая не выполняется
+                bounds[n_x + t * k + position[b], 1] = 0.0
+                continue
+            rows += [count, count]
+            cols += [n_x + t * k + position[b], n_x + (t - lag) * k + position[a]]
+            vals += [1.0 / max_volumes[b], -1.0 / max_volumes[a]]
+            count += 1
+
+    A_eq = b_eq = None
+    if k:
+        A_ub = [sparse.hstack([block, sparse.csr_matrix((block.shape[0], n_y))], format="csr") for block in A_ub]
+        A_ub.append(sparse.csr_matrix((vals, (rows, cols)), shape=(count, n_x + n_y)))
+        b_ub.append(np.zeros(count))
+
+        # Нарастающий итог: y[t] − y[t−1] − x[t] = 0
+        selection = sparse.csr_matrix((np.ones(k), (np.arange(k), linked)), shape=(k, n))
+        difference = sparse.eye(n_periods) - sparse.eye(n_periods, k=-1)
+        A_eq = sparse.hstack([-sparse.kron(sparse.eye(n_periods), selection),
+                              sparse.kron(difference, sparse.eye(k))], format="csr")
+        b_eq = np.zeros(n_y)
+
+    return C, sparse.vstack(A_ub, format="csr"), np.concatenate(b_ub), A_eq, b_eq, bounds
+
+
+def solve_multiperiod_program(norms, capacity, max_volumes, income_per_unit, precedence=(), discount=0.0):
+    """Решение многопериодной производственной программы (см. build_multiperiod_model)
+
+    Модель решается внутренней точкой HiGHS — на многопериодных задачах она заметно
+    быстрее симплекс-метода. Возвращает словарь с полями success, status, message, fun
+    и volumes — массив объёмов (периоды × работы); выдачу по периодам выполняет
+    iter_schedule_periods без построения общей таблицы.
+    """
+    from scipy.optimize import linprog
+
+    capacity = np.atleast_2d(np.asarray(capacity, dtype=float))
+    n_periods, n = capacity.shape[0], len(income_per_unit)
+    C, A_ub, b_ub, A_eq, b_eq, bounds = build_multiperiod_model(norms, capacity, max_volumes, income_per_unit,
+                                                                precedence=precedence, discount=discount)
+    res_linprog = linprog(C, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs-ipm')
+    volumes = None
+    if res_linprog.x is not None:
+        volumes = np.maximum(res_linprog.x[:n_periods * n].reshape(n_periods, n), 0.0)
+    return {
+        'success': res_linprog.success,
+        'status': res_linprog.status,
+        'message': res_linprog.message,
+        'fun': res_linprog.fun,
+        'volumes': volumes
+    }
+
+
+def iter_schedule_periods(result, norms, income_per_unit):
+    """Потоковая выдача плана по периодам: (период, объёмы работ, расход ресурсов, доход)"""
+    from scipy import sparse
+
+    norms = sparse.csr_matrix(norms, dtype=float)
+    income = np.asarray(income_per_unit, dtype=float)
+    for t, volumes in enumerate(result['volumes']):
+        yield t + 1, volumes, norms @ volumes, float(income @ volumes)
+
+
+def write_schedule(result, norms, income_per_unit, output_path, works=None):
+    """Запись многопериодного плана в CSV по одному периоду за раз
+
+    В файл попадают только работы с ненулевым объёмом в периоде.
+    Возвращает количество записанных периодов.
+    """
+    names = None if works is None else np.asarray(works, dtype=object)
+    income = np.asarray(income_per_unit, dtype=float)
+    written = 0
+    for period, volumes, _, _ in iter_schedule_periods(result, norms, income):
+        active = np.flatnonzero(volumes > 1e-9)
+        chunk = pd.DataFrame({
+            'Период': period,
+            'Работа': active + 1 if names is None else names[active],
+            'Объем работ': volumes[active],
+            'Доход, тыс.руб.': volumes[active] * income[active],
+        })
+        chunk.to_csv(output_path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+        written += 1
+    return written
+
+
+def main_task3(integer=False):
+    """Основная функция решения Задачи 3
 
-def main_task3():
-    """Основная функция решения Задачи 3"""
+    integer -- целочисленный режим: штучные работы (дренаж, ограждения и знаки,
+    разметка) планируются целыми единицами с ограничением времени решения.
+    """
     global RESULT_DATA, OPTIMIZATION_RESULTS
 
     try:
@@ -84,40 +506,31 @@ def main_task3():
     print("Запуск оптимизации методом линейного программирования...")
     print("-" * 100)
 
-    # Целевая функция (максимизация дохода, поэтому минус)
-    C = [-income for income in income_per_unit]
-
-    # Матрица ограничений
-    # Первые 8 строк - ограничения на максимальные объемы работ
-    A_ub = []
-    for i in range(8):
-        row = [0] * 8
-        row[i] = 1
-        A_ub.append(row)
-
-    # Добавляем ограничения по ресурсам
-    A_ub.append(norm_workers)  # ограничение по рабочим
-    A_ub.append(norm_materials)  # ограничение по сырью
-
-    # Вектор ограничений
-    B_ub = max_volumes + [total_workers, total_materials]
-
     # Решение задачи
     try:
-        res_linprog = linprog(C, A_ub=A_ub, b_ub=B_ub, bounds=(0, None), method='highs')
-
-        if not res_linprog.success:
-            print(f"⚠️ ПРЕДУПРЕЖДЕНИЕ: Оптимизация завершена с кодом: {res_linprog.message}")
-            print(f"   Статус: {res_linprog.status}")
-
-        result = res_linprog.x
-        total_income = abs(res_linprog.fun)
+        if integer:
+            res_linprog = solve_integer_program(np.vstack([norm_workers, norm_materials]),
+                                                [total_workers, total_materials], max_volumes, income_per_unit,
+                                                integrality=INTEGER_WORKS, time_limit=INTEGER_TIME_LIMIT)
+            if res_linprog['mip_gap'] is not None and res_linprog['x'] is not None:
+                print(f"Целочисленный режим: разрыв до оценки оптимума {res_linprog['mip_gap']:.4%}")
+        else:
+            res_linprog = solve_production_program(norm_workers, norm_materials, max_volumes, income_per_unit,
+                                                   total_workers, total_materials, cache=SolutionCache())
+
+        if not res_linprog['success']:
+            print(f"⚠️ ПРЕДУПРЕЖДЕНИЕ: Оптимизация завершена с кодом: {res_linprog['message']}")
+            print(f"   Статус: {res_linprog['status']}")
+
+        result = res_linprog['x']
 
         # Проверка результата
         if result is None or len(result) == 0:
             print("❌ ОШИБКА: Не удалось получить решение")
             return
 
+        total_income = abs(res_linprog['fun'])
+
         # Округляем очень маленькие значения до нуля
         result = np.where(result < 0.01, 0, result)
 
@@ -159,7 +572,10 @@ def main_task3():
         'used_materials': used_materials,
         'total_workers': total_workers,
         'total_materials': total_materials,
-        'income_per_unit': income_per_unit
+        'income_per_unit': income_per_unit,
+        'duals': res_linprog.get('duals'),
+        'reduced_costs': res_linprog.get('reduced_costs'),
+        'rhs_ranges': res_linprog.get('rhs_ranges')
     }
 
     print("ОПТИМАЛЬНАЯ ПРОИЗВОДСТВЕННАЯ ПРОГРАММА:")
@@ -212,6 +628,24 @@ def main_task3():
     else:
         print("⚠️ ВНИМАНИЕ: Некоторые ограничения нарушены!")
 
+    # ==================== АНАЛИЗ ЧУВСТВИТЕЛЬНОСТИ ====================
+    if res_linprog.get('duals') is not None:
+        print()
+        print("ДВОЙСТВЕННЫЕ ОЦЕНКИ РЕСУРСОВ:")
+        print("-" * 100)
+        print(f"   {'Ресурс':<20} {'Доход за ед., тыс.руб.':>24} {'Оценка действует в диапазоне':>40}")
+        for name, dual, (low, high) in zip(["Рабочие (чел-ч)", "Сырье (м³)"], res_linprog['duals'],
+                                           res_linprog['rhs_ranges']):
+            high_text = "∞" if np.isinf(high) else f"{high:,.2f}"
+            print(f"   {name:<20} {dual:>24.4f} {f'{low:,.2f} — {high_text}':>40}")
+        print("-" * 100)
+
+        print("ПРИВЕДЁННЫЕ ДОХОДЫ ВИДОВ РАБОТ (тыс.руб. на единицу сверх плана / при вводе в программу):")
+        for i, reduced in enumerate(res_linprog['reduced_costs']):
+            if abs(reduced) > 1e-9:
+                print(f"   {i + 1:<3} {works[i][:58]:<60} {reduced:>12.4f}")
+        print("-" * 100)
+
     print()
     print("=" * 100)
     print("✅ Оптимизация завершена успешно!")
@@ -367,6 +801,9 @@ if __name__ == "__main__":
         # Сначала выполняем расчёт, потом создаём документ
         main_task3()
         generate_document()
+    elif len(sys.argv) > 1 and sys.argv[1] == "integer":
+        # Расчёт с целочисленными объёмами штучных работ
+        main_task3(integer=True)
     else:
         # Только расчёт
         main_task3()
\ No newline at end of file
@@ -1,6 +1,7 @@
 # ======================== task4.py — ИСПРАВЛЕННАЯ ВЕРСИЯ ========================
 import pandas as pd
 import numpy as np
+import heapq
 import os
 from datetime import datetime
 
@@ -8,6 +9,302 @@ from datetime import datetime
 RESULT_DATA = None
 OPTIMIZATION_RESULTS = None
 
+# Предельный объём таблиц ДП в режиме memory="auto", байт
+DP_MEMORY_LIMIT = 256 * 1024 * 1024
+
+
+def _maxplus_stage(previous, column, block_size=1 << 22):
+    """Шаг ДП: свёртка (max, +) предыдущей строки F со столбцом доходов объекта
+
+    F_new[k] = max по x <= min(k, cap) от F_prev[k − x] + column[x]; при равенстве
+    выбирается наименьшее x. Кандидаты строятся окном по сдвигам F_prev блоками по k,
+    чтобы промежуточный массив не превышал block_size элементов.
+    Возвращает (F_new, X) — значения и оптимальные количества для каждого k.
+    """
+    cap = len(column) - 1
+    size = len(previous)
+    padded = np.concatenate([np.full(cap, -np.inf), previous])
+    values = np.empty(size)
+    choices = np.empty(size, dtype=np.int64)
+
+    step = max(1, block_size // (cap + 1))
+    for start in range(0, size, step):
+        stop = min(size, start + step)
+        # windows[k, j] = padded[k + j], т.е. F_prev[k − cap + j]; x = cap − j
+        windows = np.lib.stride_tricks.sliding_window_view(padded[start:stop + cap], cap + 1)
+        candidates = windows[:, ::-1] + column
+        best = np.argmax(candidates, axis=1)
+        choices[start:stop] = best
+        values[start:stop] = candidates[np.arange(stop - start), best]
+    return values, choices
+
+
+def concave_columns(returns, limits, tol=1e-9):
+    """Проверка вогнутости столбцов доходов после исправления
+
+    Так как ресурс можно оставить нераспределённым, столбец заменяется своим нарастающим
+    максимумом (лишние бригады объекту не выдаются) — это не меняет оптимума.
+    Возвращает True, если все исправленные столбцы (до своих ограничений) имеют
+    невозрастающие приросты.
+    """
+    for i, limit in enumerate(limits):
+        column = np.maximum.accumulate(np.asarray(returns[:limit + 1, i], dtype=float))
+        gains = np.diff(column)
+        if np.any(np.diff(gains) > tol * max(1.0, np.abs(gains).max(initial=0))):
+            return False
+    return True
+
+
+def _greedy_allocation(returns, total, limits):
+    """Распределение по наибольшему приросту с кучей — точно для вогнутых столбцов
+
+    На каждом шаге очередная единица ресурса отдаётся объекту с наибольшим приростом
+    дохода; распределение прекращается, когда положительных приростов не осталось.
+    Сложность O(K log n).
+    """
+    distribution = np.zeros(returns.shape[1], dtype=np.int64)
+    best = np.asarray(returns[0], dtype=float).copy()
+    heap = []
+
+    def push(i):
+        # Прирост до следующего значения, превышающего достигнутое (нарастающий максимум)
+        x = distribution[i] + 1
+        if x <= limits[i]:
+            heapq.heappush(heap, (-(returns[x, i] - best[i]), i))
+
+    for i in range(returns.shape[1]):
+        push(i)
+
+    remaining = total
+    while remaining > 0 and heap:
+        gain, i = heapq.heappop(heap)
+        if -gain <= 0:
+            break
+        distribution[i] += 1
+        best[i] = returns[distribution[i], i]
+        remaining -= 1
+        push(i)
+    return distribution
+
+
+def _choice_dtype(limits):
+    """Наименьший беззнаковый тип для хранения количеств ресурса в таблице X"""
+    return np.uint16 if int(np.max(limits, initial=0)) <= np.iinfo(np.uint16).max else np.uint32
+
+
+def _stage_column(returns, limits, i):
+    """Столбец доходов i-го объекта, усечённый его ограничением"""
+    return returns[:limits[i] + 1, i].astype(float)
+
+
+def _dp_last_row(returns, limits, start, stop, budget):
+    """Последняя строка F для объектов start..stop − 1 — в памяти только одна строка"""
+    row = np.zeros(budget + 1)
+    for i in range(start, stop):
+        row, _ = _maxplus_stage(row, _stage_column(returns, limits, i)[:budget + 1])
+    return row
+
+
+def _hirschberg_allocation(returns, limits, start, stop, budget, distribution):
+    """Восстановление распределения без таблицы X (разделяй и властвуй по Хиршбергу)
+
+    Объекты делятся пополам, для каждой половины считается только последняя строка F,
+    и ресурс делится между половинами по максимуму F_left[k] + F_right[budget − k];
+    далее половины решаются рекурсивно. Память O(K), время O(n·K·R·log n).
+    """
+    if stop - start == 1:
+        column = _stage_column(returns, limits, start)[:budget + 1]
+        distribution[start] = int(np.argmax(column))
+        return
+
+    middle = (start + stop) // 2
+    left = _dp_last_row(returns, limits, start, middle, budget)
+    right = _dp_last_row(returns, limits, middle, stop, budget)
+    split = int(np.argmax(left + right[::-1]))
+    _hirschberg_allocation(returns, limits, start, middle, split, distribution)
+    _hirschberg_allocation(returns, limits, middle, stop, budget - split, distribution)
+
+
+def allocate_resources(returns, total, caps=None, method="auto", memory="auto"):
+    """Оптимальное распределение однородного ресурса (бригад) по объектам
+
+    returns -- таблица доходов (количество ресурса 0..R × объекты), как smr_table;
+    количество на объект не превышает R. caps -- дополнительные ограничения на объект.
+    Ресурс может быть распределён не полностью (F[0][k] = 0 при любом k).
+    method -- "dp" (точное ДП), "greedy" (только для вогнутых столбцов, см. concave_columns)
+    или "auto" — жадный алгоритм, если все столбцы вогнуты, иначе ДП.
+    memory -- хранение таблиц ДП: "full" — полные F и X; "compact" — только текущая строка F
+    и X в uint16/uint32; "hirschberg" — без X, распределение восстанавливается делением
+    объектов пополам (память O(K)); "auto" — выбор по DP_MEMORY_LIMIT.
+    Возвращает словарь: total — максимальный доход, distribution — количество ресурса
+    по объектам, F и X — таблицы ДП (объекты + 1 × total + 1; None, если не хранятся),
+    method — использованный метод.
+    """
+    returns = np.asarray(returns)
+    integral = np.issubdtype(returns.dtype, np.integer)
+    n_objects = returns.shape[1]
+
+    limits = np.full(n_objects, returns.shape[0] - 1)
+    if caps is not None:
+        limits = np.minimum(limits, np.asarray(caps, dtype=int))
+    limits = np.clip(limits, 0, total)
+
+    if method not in ("auto", "dp", "greedy"):
+        raise ValueError(f"Неизвестный метод: {method}")
+    if method != "dp":
+        concave = concave_columns(returns, limits)
+        if method == "greedy" and not concave:
+            raise ValueError("Жадный алгоритм применим только к вогнутым столбцам доходов")
+        if concave:
+            distribution = _greedy_allocation(returns, total, limits)
+            return {
+                'total': returns[distribution, np.arange(n_objects)].sum(),
+                'distribution': distribution,
+                'F': None,
+                'X': None,
+                'method': "greedy"
+            }
+
+    if memory == "auto":
+        # Полные таблицы F и X (по 8 байт на элемент), иначе компактная X, иначе O(K)
+        cells = (n_objects + 1) * (total + 1)
+        if 16 * cells <= DP_MEMORY_LIMIT:
+            memory = "full"
+        elif _choice_dtype(limits).itemsize * cells <= DP_MEMORY_LIMIT:
+            memory = "compact"
+        else:
+            memory = "hirschberg"
+    if memory not in ("full", "compact", "hirschberg"):
+        raise ValueError(f"Неизвестный режим памяти: {memory}")
+
+    F = X = None
+    if memory == "hirschberg":
+        distribution = np.zeros(n_objects, dtype=np.int64)
+        _hirschberg_allocation(returns, limits, 0, n_objects, total, distribution)
+        best = returns[distribution, np.arange(n_objects)].sum()
+    else:
+        # X[i][k] - оптимальное количество ресурса для i-го объекта при общем количестве k
+        X = np.zeros((n_objects + 1, total + 1), dtype=np.int64 if memory == "full" else _choice_dtype(limits))
+        if memory == "full":
+            # F[i][k] - максимальный доход для первых i объектов при k единицах ресурса
+            F = np.zeros((n_objects + 1, total + 1))
+
+        # Прямой ход (в компактном режиме хранится только текущая строка F)
+        row = np.zeros(total + 1)
+        for i in range(1, n_objects + 1):
+            row, X[i] = _maxplus_stage(row, _stage_column(returns, limits, i - 1))
+            if F is not None:
+                F[i] = row
+        best = row[total]
+
+        # Обратный ход
+        distribution = np.zeros(n_objects, dtype=np.int64)
+        remaining = total
+        for i in range(n_objects, 0, -1):
+            distribution[i - 1] = X[i][remaining]
+            remaining -= int(X[i][remaining])
+
+    if integral:
+        best = int(round(best))
+        if F is not None:
+            F = F.astype(np.int64)
+    return {
+        'total': best,
+        'distribution': distribution,
+        'F': F,
+        'X': X,
+        'method': "dp"
+    }
+
+
+def _maxplus_tile(task):
+    """Свёртка (max, +) для полосы состояний многомерного ДП
+
+    previous -- срез F_prev по первой оси начиная с offset, достаточный для строк
+    start..stop − 1 результата; column -- доходы объекта на сетке количеств ресурсов.
+    Перебираются векторы x на сетке column, для каждого вся полоса обновляется одним
+    сдвинутым срезом. При равенстве остаётся первый x в порядке перебора (C-порядок).
+    Возвращает (значения полосы, номера x в развёрнутом виде).
+    """
+    previous, column, start, stop, offset = task
+    sizes = previous.shape[1:]
+    best = np.full((stop - start,) + sizes, -np.inf)
+    choice = np.zeros((stop - start,) + sizes, dtype=np.uint32)
+    mask = np.empty_like(best, dtype=bool)
+
+    for flat, x in enumerate(np.ndindex(column.shape)):
+        value = column[x]
+        first = max(start, x[0])
+        if value == -np.inf or first >= stop or any(xj > size - 1 for xj, size in zip(x[1:], sizes)):
+            continue
+        out = (slice(first - start, stop - start),) + tuple(slice(xj, None) for xj in x[1:])
+        source = (slice(first - x[0] - offset, stop - x[0] - offset),) + tuple(
+            slice(0, size - xj) for xj, size in zip(x[1:], sizes))
+        candidates = previous[source] + value
+        target, hit = best[out], mask[out]
+        np.greater(candidates, target, out=hit)
+        np.copyto(target, candidates, where=hit)
+        np.copyto(choice[out], flat, where=hit)
+    return best, choice
+
+
+def allocate_multi_resources(returns, totals, workers=None, tiles_per_worker=4):
+    """Распределение нескольких видов ресурсов (бригады, катки, самосвалы...) по объектам
+
+    returns -- доходы объектов на сетке количеств ресурсов: массив формы
+    (объекты, R1 + 1, R2 + 1[, R3 + 1]); -inf — недопустимое сочетание.
+    totals -- наличие каждого ресурса (K1, K2[, K3]); ресурсы можно распределить не полностью.
+    Состояния ДП хранятся массивом (K1 + 1) × (K2 + 1) × ...; на каждом шаге свёртка
+    делится на полосы по первой оси, которые считаются в пуле процессов (workers).
+    Возвращает словарь: total — максимальный доход, distribution — количества ресурсов
+    по объектам (объекты × число ресурсов).
+    """
+    returns = np.asarray(returns, dtype=float)
+    totals = tuple(int(k) for k in totals)
+    n_objects = returns.shape[0]
+    if returns.ndim - 1 != len(totals):
+        raise ValueError("Размерность таблицы доходов не совпадает с числом ресурсов")
+
+    workers = workers or os.cpu_count() or 1
+    n_tiles = max(1, min(totals[0] + 1, workers * tiles_per_worker if workers > 1 else 1))
+    bounds = np.linspace(0, totals[0] + 1, n_tiles + 1).astype(int)
+
+    row = np.zeros(tuple(k + 1 for k in totals))
+    X = np.zeros((n_objects,) + row.shape, dtype=np.uint32)
+    executor = None
+    if workers > 1 and n_tiles > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # Прямой ход
+        for i in range(n_objects):
+            column = returns[i][tuple(slice(0, k + 1) for k in totals)]
+            tasks = []
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                offset = max(0, start - (column.shape[0] - 1))
+                tasks.append((row[offset:stop], column, start, stop, offset))
+            results = list(executor.map(_maxplus_tile, tasks) if executor else map(_maxplus_tile, tasks))
+            row = np.concatenate([values for values, _ in results])
+            X[i] = np.concatenate([choices for _, choices in results])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Обратный ход
+    distribution = np.zeros((n_objects, len(totals)), dtype=np.int64)
+    remaining = list(totals)
+    for i in range(n_objects - 1, -1, -1):
+        shape = tuple(min(r, k + 1) for r, k in zip(returns.shape[1:], totals))
+        x = np.unravel_index(int(X[i][tuple(remaining)]), shape)
+        distribution[i] = x
+        remaining = [k - xj for k, xj in zip(remaining, x)]
+
+    return {
+        'total': row[totals],
+        'distribution': distribution
+    }
+
 
 def main_task4():
     """Основная функция решения Задачи 4 - Динамическое программирование"""
@@ -38,7 +335,7 @@ def main_task4():
     ]
 
     total_brigades = 4  # Всего бригад для распределения
-    n_objects = 4  # Количество объектов
+    n_objects = len(objects)  # Количество объектов
 
     print("ИСХОДНЫЕ ДАННЫЕ:")
     print("-" * 90)
@@ -50,7 +347,7 @@ def main_task4():
     print("-" * 90)
     print(f"{'Кол-во бригад':<15} {'Объект 1':<12} {'Объект 2':<12} {'Объект 3':<12} {'Объект 4':<12}")
     print("-" * 90)
-    for brigades in range(5):
+    for brigades in range(len(smr_table)):
         print(
             f"{brigades:<15} {smr_table[brigades][0]:<12} {smr_table[brigades][1]:<12} {smr_table[brigades][2]:<12} {smr_table[brigades][3]:<12}")
     print("-" * 90)
@@ -60,35 +357,9 @@ def main_task4():
     print("Запуск алгоритма динамического программирования...")
     print("-" * 90)
 
-    # F[i][k] - максимальный объем СМР для первых i объектов при k бригадах
-    F = [[0 for _ in range(total_brigades + 1)] for _ in range(n_objects + 1)]
-
-    # X[i][k] - оптимальное количество бригад для i-го объекта при общем количестве k
-    X = [[0 for _ in range(total_brigades + 1)] for _ in range(n_objects + 1)]
-
-    # Прямой ход - заполнение таблицы
-    for i in range(1, n_objects + 1):
-        for k in range(total_brigades + 1):
-            max_smr = -1
-            best_x = 0
-
-            # Перебираем возможное количество бригад для текущего объекта
-            for x in range(min(k, 4) + 1):  # не более 4 бригад на объект
-                current_smr = F[i - 1][k - x] + smr_table[x][i - 1]
-                if current_smr > max_smr:
-                    max_smr = current_smr
-                    best_x = x
-
-            F[i][k] = max_smr
-            X[i][k] = best_x
-
-    # Обратный ход - восстановление оптимального решения
-    brigades_distribution = [0] * n_objects
-    remaining_brigades = total_brigades
-
-    for i in range(n_objects, 0, -1):
-        brigades_distribution[i - 1] = X[i][remaining_brigades]
-        remaining_brigades -= X[i][remaining_brigades]
+    allocation = allocate_resources(np.array(smr_table), total_brigades)
+    F, X = allocation['F'], allocation['X']
+    brigades_distribution = [int(x) for x in allocation['distribution']]
 
     # Расчет объемов СМР для каждого объекта
     smr_per_object = []
@@ -96,7 +367,7 @@ def main_task4():
         smr = smr_table[brigades_distribution[i]][i]
         smr_per_object.append(smr)
 
-    total_smr = F[n_objects][total_brigades]
+    total_smr = int(allocation['total'])
 
     # ==================== РЕЗУЛЬТАТЫ ====================
     print()
@@ -0,0 +1,99 @@
+# Модули задач лежат в корне репозитория и запускаются как скрипты — делаем их импортируемыми
+import itertools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import task2  # noqa: E402
+
+
+def _random_projects(rng, n, coarse=False, max_risk=4):
+    """Случайная таблица проектов; coarse — крупные целые шаги (много равных и доминируемых вариантов)"""
+    if coarse:
+        return pd.DataFrame({
+            'Прибыль': rng.integers(1, 10, n) * 1e6,
+            'Бюджет': rng.integers(1, 10, n) * 1e6,
+            'Ресурсы_чч': rng.integers(5, 30, n) * 100,
+            'Риск': rng.integers(1, max_risk, n),
+            'Важность': rng.integers(1, 10, n) / 10,
+        })
+    return pd.DataFrame({
+        'Прибыль': rng.integers(1e6, 1e7, n),
+        'Бюджет': rng.integers(1e6, 1e7, n),
+        'Ресурсы_чч': rng.integers(500, 3000, n),
+        'Риск': rng.integers(1, max_risk, n),
+        'Важность': rng.random(n),
+    })
+
+
+def _random_instance(rng, n, coarse=False, pairs=True):
+    """Случайный портфель со случайными ограничениями, зависимостями и взаимоисключениями
+
+    Возвращает таблицу проектов, массивы коэффициентов, ограничения
+    (max_budget, min_profit, max_manhours, max_risk) и списки пар dependencies, exclusions.
+    """
+    df = _random_projects(rng, n, coarse=coarse)
+    arrays = task2.portfolio_arrays(df)
+    limits = (arrays['Бюджет'].sum() * rng.uniform(0.1, 0.8),
+              arrays['Прибыль'].sum() * rng.uniform(0.0, 0.5),
+              arrays['Ресурсы_чч'].sum() * rng.uniform(0.2, 0.9),
+              arrays['Риск'].sum() * rng.uniform(0.2, 0.9))
+
+    def random_pairs():
+        if not pairs or n < 2:
+            return []
+        return [tuple(int(i) for i in rng.choice(n, 2, replace=False)) for _ in range(int(rng.integers(0, 3)))]
+
+    return df, arrays, limits, random_pairs(), random_pairs()
+
+
+def _tight_instance(rng, n):
+    """Портфель среднего размера с ограничениями на уровне 40 % сумм (прибыль — 20 %)"""
+    df = _random_projects(rng, n, max_risk=6)
+    arrays = task2.portfolio_arrays(df)
+    limits = (arrays['Бюджет'].sum() * 0.4, arrays['Прибыль'].sum() * 0.2,
+              arrays['Ресурсы_чч'].sum() * 0.4, arrays['Риск'].sum() * 0.4)
+    return df, arrays, limits
+
+
+def _feasible_importances(arrays, limits, dependencies=(), exclusions=(), admissible=None):
+    """Важность всех допустимых портфелей полным перебором, по убыванию
+
+    admissible -- дополнительная проверка вектора выбора (например, декларативных правил).
+    """
+    max_budget, min_profit, max_manhours, max_risk = limits
+    found = []
+    for bits in itertools.product([0.0, 1.0], repeat=len(arrays['Важность'])):
+        y = np.array(bits)
+        if any(y[i] != y[j] for i, j in dependencies) or any(y[i] + y[j] > 1 for i, j in exclusions):
+            continue
+        if admissible is not None and not admissible(y):
+            continue
+        totals = task2.portfolio_totals(arrays, y)
+        if (totals['total_budget'] <= max_budget and totals['total_profit'] >= min_profit
+                and totals['total_hours'] <= max_manhours and totals['total_risk'] <= max_risk):
+            found.append(totals['total_importance'])
+    return sorted(found, reverse=True)
+
+
+@pytest.fixture
+def portfolio_instance():
+    """Генератор случайных портфелей: (rng, n, coarse=False, pairs=True)"""
+    return _random_instance
+
+
+@pytest.fixture
+def tight_instance():
+    """Генератор портфелей среднего размера с жёсткими ограничениями: (rng, n)"""
+    return _tight_instance
+
+
+@pytest.fixture
+def feasible_importances():
+    """Перебор допустимых портфелей: (arrays, limits, dependencies, exclusions, admissible)"""
+    return _feasible_importances
@@ -0,0 +1,66 @@
+# ==================== РЕГРЕССИОННЫЕ ТЕСТЫ: КЭШ РЕШЕНИЙ ====================
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import task2
+import task3
+from solution_cache import SolutionCache, canonical_key
+
+
+def blocked_directory(tmp_path):
+    """Путь к каталогу кэша, который нельзя создать (на его месте обычный файл)"""
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    return str(blocker / "cache")
+
+
+def test_cache_round_trip(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache"))
+    key = canonical_key("test", np.arange(3), [1.0, 2.0])
+
+    assert cache.get(key) is None
+    cache.put(key, {'x': np.arange(3)})
+    assert cache.get(key)['x'].tolist() == [0, 1, 2]
+
+
+def test_unavailable_directory_disables_cache(tmp_path):
+    cache = SolutionCache(blocked_directory(tmp_path))
+
+    assert not cache.enabled
+    cache.put("key", {'x': 1})
+    assert cache.get("key") is None
+    cache.clear()
+
+
+def test_failed_write_is_skipped_and_temp_file_removed(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    cache = SolutionCache(str(directory))
+
+    def disk_full(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(pickle, "dump", disk_full)
+    cache.put("key", {'x': 1})
+
+    assert os.listdir(directory) == []
+    assert cache.get("key") is None
+
+
+def test_solvers_return_result_when_cache_is_unavailable(tmp_path):
+    cache = SolutionCache(blocked_directory(tmp_path))
+
+    df = pd.DataFrame({
+        'Прибыль': [6000000, 5000000], 'Бюджет': [3200000, 2100000],
+        'Ресурсы_чч': [2800, 1800], 'Риск': [3, 3], 'Важность': [0.3, 0.2],
+    })
+    portfolio = task2.solve_portfolio(task2.portfolio_arrays(df), 7000000, 0, 5800, 10,
+                                      solver="bnb", cache=cache)
+    assert portfolio['status'] == 1 and portfolio['total_importance'] == pytest.approx(0.5)
+
+    program = task3.solve_resource_program(np.array([[1.0, 2.0], [3.0, 1.0]]), [10.0, 15.0],
+                                           [10.0, 10.0], [3.0, 2.0], cache=cache)
+    assert program['success']
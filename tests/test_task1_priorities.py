@@ -0,0 +1,16 @@
+# ==================== РЕГРЕССИОННЫЕ ТЕСТЫ: ПРИОРИТЕТЫ ЗАКАЗОВ (task1 → task2) ====================
+import pytest
+
+import task1
+
+
+def test_project_priorities_match_task1_ranking(capsys):
+    task1.main_task1()
+    capsys.readouterr()
+
+    priorities = task1.project_priorities()
+    ranking = dict(zip(task1.RESULT_DF["Заказ"], task1.RESULT_DF["Глобальный приоритет"]))
+
+    assert priorities == pytest.approx(ranking)
+    assert priorities["Строительство скоростной трассы для многофункционального комплекса"] == 0.152229
+    assert sum(priorities.values()) == pytest.approx(1.0, abs=1e-5)
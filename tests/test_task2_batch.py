@@ -0,0 +1,62 @@
+# ==================== РЕГРЕССИОННЫЕ ТЕСТЫ: ПАКЕТНЫЙ РЕЖИМ (task2) ====================
+import pandas as pd
+import pytest
+
+import task2
+
+
+def projects():
+    """Три проекта: бюджета 7 млн хватает на первые два"""
+    return pd.DataFrame({
+        'Прибыль': [6000000, 5000000, 4500000],
+        'Бюджет': [3200000, 2100000, 2150000],
+        'Ресурсы_чч': [2800, 1800, 1430],
+        'Риск': [3, 3, 2],
+        'Важность': [0.3, 0.2, 0.1],
+    })
+
+
+def mixed_scenarios():
+    """Допустимые сценарии вперемешку с недостижимой минимальной прибылью"""
+    return pd.DataFrame({
+        'scenario': ["a", "b", "c", "d"],
+        'max_budget': [7000000, 7000000, 7000000, 3000000],
+        'min_profit': [0, 0, 90000000, 0],
+        'max_manhours': [5800, 5800, 5800, 5800],
+        'max_risk': [10, 10, 10, 10],
+    })
+
+
+def check_results(results):
+    assert results['scenario'].tolist() == ["a", "b", "c", "d"]
+    assert results['status'].tolist() == [1, 1, -1, 1]
+
+    infeasible = results.iloc[2]
+    assert pd.isna(infeasible['total_importance']) and pd.isna(infeasible['selected_count'])
+    assert pd.isna(infeasible['selected']) or infeasible['selected'] == ""
+
+    assert results['selected_count'].iloc[[0, 1, 3]].tolist() == [2, 2, 1]
+    assert results['gap'].iloc[[0, 1, 3]].tolist() == [0.0, 0.0, 0.0] and pd.isna(infeasible['gap'])
+    assert results['total_importance'].iloc[[0, 1, 3]].tolist() == pytest.approx([0.5, 0.5, 0.2])
+
+
+@pytest.mark.parametrize("flush_every", [1, 2, 1000])
+def test_mixed_batch_to_csv(tmp_path, flush_every):
+    output = tmp_path / "results.csv"
+    solved = task2.solve_scenarios(projects(), mixed_scenarios(), output, solver="bnb",
+                                   workers=1, flush_every=flush_every)
+
+    assert solved == 4
+    check_results(pd.read_csv(output))
+
+
+@pytest.mark.parametrize("flush_every", [1, 2, 1000])
+def test_mixed_batch_to_parquet(tmp_path, flush_every):
+    pytest.importorskip("pyarrow")
+    output = tmp_path / "results.parquet"
+    # Порции с недопустимым сценарием и без него должны иметь одну схему
+    solved = task2.solve_scenarios(projects(), mixed_scenarios(), output, solver="bnb",
+                                   workers=1, flush_every=flush_every)
+
+    assert solved == 4
+    check_results(pd.read_parquet(output))
@@ -0,0 +1,60 @@
+# ==================== РЕГРЕССИОННЫЕ ТЕСТЫ: МЕТОД ВЕТВЕЙ И ГРАНИЦ (task2) ====================
+import functools
+
+import numpy as np
+import pytest
+
+import task2
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_bnb_matches_brute_force(seed, portfolio_instance, feasible_importances):
+    rng = np.random.default_rng(seed)
+    _, arrays, limits, dependencies, exclusions = portfolio_instance(rng, int(rng.integers(1, 11)))
+
+    feasible = feasible_importances(arrays, limits, dependencies, exclusions)
+    result = task2.solve_portfolio(arrays, *limits, dependencies, exclusions, solver="bnb")
+
+    if not feasible:
+        assert result['status'] == -1
+        assert not result['selection'].any()
+    else:
+        assert result['status'] == 1
+        assert result['total_importance'] == pytest.approx(feasible[0], abs=1e-9)
+        selection = result['selection']
+        assert all(selection[i] == selection[j] for i, j in dependencies)
+        assert all(selection[i] + selection[j] <= 1 for i, j in exclusions)
+
+
+def test_bnb_node_limit_returns_feasible_incumbent(tight_instance):
+    _, arrays, limits = tight_instance(np.random.default_rng(2024), 60)
+
+    result = task2.solve_portfolio_bnb(arrays, *limits, max_nodes=1)
+    totals = task2.portfolio_totals(arrays, result['selection'])
+
+    assert result['status'] == task2.STATUS_FEASIBLE
+    assert result['gap'] > 0
+    assert totals['total_budget'] <= limits[0] and totals['total_profit'] >= limits[1]
+    assert totals['total_hours'] <= limits[2] and totals['total_risk'] <= limits[3]
+
+    full = task2.solve_portfolio_bnb(arrays, *limits)
+    assert full['status'] == 1 and full['gap'] == 0
+    assert arrays['Важность'] @ full['selection'] >= arrays['Важность'] @ result['selection']
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_bnb_without_simplex_convergence_enumerates_to_fixed_leaves(seed, monkeypatch, portfolio_instance,
+                                                                    feasible_importances):
+    # Симплекс-метод останавливается после первой итерации — узлы ветвятся до полной фиксации групп
+    monkeypatch.setattr(task2, "_dual_simplex", functools.partial(task2._dual_simplex, max_pivots=0))
+    rng = np.random.default_rng(500 + seed)
+    _, arrays, limits, dependencies, exclusions = portfolio_instance(rng, int(rng.integers(1, 9)))
+
+    feasible = feasible_importances(arrays, limits, dependencies, exclusions)
+    result = task2.solve_portfolio(arrays, *limits, dependencies, exclusions, solver="bnb")
+
+    if not feasible:
+        assert result['status'] == -1
+    else:
+        assert result['status'] == 1
+        assert result['total_importance'] == pytest.approx(feasible[0], abs=1e-9)
@@ -0,0 +1,41 @@
+# ==================== РЕГРЕССИОННЫЕ ТЕСТЫ: ЛАГРАНЖЕВА ЭВРИСТИКА (task2) ====================
+import numpy as np
+import pytest
+
+import task2
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_lagrangian_status_reports_proof_of_optimality(seed, portfolio_instance, feasible_importances):
+    rng = np.random.default_rng(seed)
+    _, arrays, limits, dependencies, exclusions = portfolio_instance(rng, int(rng.integers(1, 11)))
+
+    feasible = feasible_importances(arrays, limits, dependencies, exclusions)
+    result = task2.solve_portfolio(arrays, *limits, dependencies, exclusions, solver="lagrangian")
+
+    # Статус 1 допустим только при доказанном оптимуме
+    if result['status'] == 1:
+        assert result['total_importance'] == pytest.approx(feasible[0], abs=1e-9)
+        assert result['gap'] == pytest.approx(0.0, abs=1e-9)
+    elif result['status'] == task2.STATUS_FEASIBLE:
+        assert feasible and result['total_importance'] <= feasible[0] + 1e-9
+        assert result['gap'] > 0
+    else:
+        assert result['status'] == 0
+        assert not result['selection'].any()
+
+
+def test_pareto_frontier_keeps_heuristic_status_and_gap(tight_instance):
+    df, arrays, limits = tight_instance(np.random.default_rng(7), 40)
+    budget, hours = limits[0], limits[2]
+    profit_levels = [0.0, limits[1]]
+    risk_levels = [arrays['Риск'].sum() * 0.3, arrays['Риск'].sum() * 0.5]
+
+    heuristic = task2.pareto_frontier(df, budget, hours, profit_levels, risk_levels,
+                                      solver="lagrangian", workers=1)
+    exact = task2.pareto_frontier(df, budget, hours, profit_levels, risk_levels, solver="bnb", workers=1)
+
+    assert (heuristic['status'] == task2.STATUS_FEASIBLE).any()
+    assert set(heuristic['status']) <= {1, task2.STATUS_FEASIBLE}
+    assert (heuristic.loc[heuristic['status'] == task2.STATUS_FEASIBLE, 'gap'] > 0).all()
+    assert (exact['status'] == 1).all() and (exact['gap'] == 0).all()
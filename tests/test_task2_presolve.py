@@ -0,0 +1,95 @@
+# ==================== РЕГРЕССИОННЫЕ ТЕСТЫ: ПРАВИЛА, PRESOLVE И K ЛУЧШИХ ПОРТФЕЛЕЙ (task2) ====================
+import numpy as np
+import pytest
+
+import task2
+
+
+def solvers():
+    """Решатели для проверки: встроенный всегда, CBC — если установлен pulp"""
+    return ["bnb", "cbc"] if task2._resolve_solver("auto") == "cbc" else ["bnb"]
+
+
+def random_rules(rng, n):
+    """Случайный набор декларативных правил всех типов"""
+    rules = []
+    for _ in range(int(rng.integers(0, 5))):
+        kind = rng.choice(["together", "requires", "implies", "excludes", "at_most"])
+        if kind == "together":
+            rules.append({"type": kind, "projects": rng.choice(n, int(rng.integers(2, min(n, 3) + 1)),
+                                                               replace=False).tolist()})
+        elif kind == "requires":
+            i, j = rng.choice(n, 2, replace=False).tolist()
+            rules.append({"type": kind, "project": i, "requires": j})
+        elif kind == "implies":
+            i, j = rng.choice(n, 2, replace=False).tolist()
+            rules.append({"type": kind, "if": i, "then": j})
+        elif kind == "excludes":
+            rules.append({"type": kind, "projects": rng.choice(n, int(rng.integers(2, n + 1)),
+                                                               replace=False).tolist()})
+        else:
+            rules.append({"type": kind, "projects": rng.choice(n, int(rng.integers(2, n + 1)),
+                                                               replace=False).tolist(),
+                          "k": int(rng.integers(0, 3))})
+    return rules
+
+
+def satisfies(y, rules):
+    """Проверка выбора на соответствие правилам напрямую, без компиляции"""
+    for rule in rules:
+        kind = rule["type"]
+        if kind == "together" and len({y[i] for i in rule["projects"]}) > 1:
+            return False
+        if kind == "requires" and y[rule["project"]] > y[rule["requires"]]:
+            return False
+        if kind == "implies" and y[rule["if"]] > y[rule["then"]]:
+            return False
+        if kind == "excludes" and sum(y[i] for i in rule["projects"]) > 1:
+            return False
+        if kind == "at_most" and sum(y[i] for i in rule["projects"]) > rule["k"]:
+            return False
+    return True
+
+
+@pytest.mark.parametrize("solver", solvers())
+@pytest.mark.parametrize("seed", range(60))
+def test_presolve_keeps_optimum(seed, solver, portfolio_instance, feasible_importances):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 10))
+    _, arrays, limits, _, _ = portfolio_instance(rng, n, coarse=True, pairs=False)
+    rules = random_rules(rng, n)
+
+    feasible = feasible_importances(arrays, limits, admissible=lambda y: satisfies(y, rules))
+    result = task2.solve_portfolio(arrays, *limits, solver=solver, rules=rules)
+
+    assert result['presolve']['variables'] <= n
+    if not feasible:
+        assert result['status'] == -1
+    else:
+        assert result['status'] == 1
+        assert result['total_importance'] == pytest.approx(feasible[0], abs=1e-9)
+        assert satisfies(result['selection'], rules)
+
+
+@pytest.mark.parametrize("solver", solvers())
+@pytest.mark.parametrize("seed", range(40))
+def test_k_best_enumerates_all_feasible_portfolios(seed, solver, portfolio_instance, feasible_importances):
+    rng = np.random.default_rng(1000 + seed)
+    n = int(rng.integers(2, 7))
+    df, arrays, limits, _, _ = portfolio_instance(rng, n, coarse=True, pairs=False)
+    rules = random_rules(rng, n)
+
+    feasible = feasible_importances(arrays, limits, admissible=lambda y: satisfies(y, rules))
+    table = task2.k_best_portfolios(df, *limits, k=len(feasible) + 1, rules=rules, solver=solver)
+
+    # Запас в одну альтернативу: перебор должен остановиться сам, когда допустимых не останется
+    assert len(table) == len(feasible)
+    if table.empty:
+        return
+    assert table['total_importance'].tolist() == pytest.approx(feasible, abs=1e-9)
+    assert table['selected'].is_unique
+    assert table['rank'].tolist() == list(range(1, len(feasible) + 1))
+    for selected in table['selected']:
+        y = np.zeros(n)
+        y[np.array(selected, dtype=int) - 1] = 1
+        assert satisfies(y, rules)